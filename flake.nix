@@ -29,6 +29,7 @@
             pydantic
             aiosqlite
             watchfiles
+            orjson
           ] ++ pkgs.lib.optionals (python.pkgs.pythonOlder "3.11") [
             tomli
           ];
@@ -2,36 +2,120 @@
 
 from __future__ import annotations
 
-import json
+import io
 import socket
+from collections.abc import Iterator
 from pathlib import Path
+from typing import cast
+
+from termrecord.jsonutil import dumps, loads
+from termrecord.protocol import HEADER_SIZE, decode_header, encode_frame
+
+# Receive buffer; a response this size or smaller normally takes one recv call
+RECV_BUFFER_SIZE = 65536
 
 
 class WatcherClient:
-    """Client for communicating with watcher service."""
+    """Client for communicating with watcher service.
+
+    The connection is opened on first use and reused for later requests
+    until close() is called (or the context manager exits).
+    """
 
     def __init__(self, socket_path: Path):
         self.socket_path = socket_path.expanduser()
+        self._sock: socket.socket | None = None
+        self._reader: io.BufferedReader | None = None
+
+    def __enter__(self) -> WatcherClient:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
 
     def send(self, message: dict) -> dict:
         """Send message to watcher and get response."""
-        if not self.socket_path.exists():
-            raise ConnectionError(f"Socket not found: {self.socket_path}")
+        sock = self._connect()
+        try:
+            sock.sendall(encode_frame(dumps(message)))
+            return loads(self._read_frame())
+        except BaseException:
+            # The stream may be mid-frame; reconnect on the next request
+            self.close()
+            raise
 
-        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    def stream(self, message: dict) -> Iterator[dict]:
+        """Send message and yield each item of a streamed response.
+
+        The generator's return value is the closing frame (e.g. the list_end
+        frame carrying the next-page cursor).
+        """
+        sock = self._connect()
+        finished = False
         try:
-            sock.connect(str(self.socket_path))
-            sock.sendall(json.dumps(message).encode() + b"\n")
+            sock.sendall(encode_frame(dumps(message)))
+
+            begin = loads(self._read_frame())
+            if not begin.get("type", "").endswith("_begin"):
+                finished = True  # Plain single-frame (error) response
+                raise RuntimeError(begin.get("error", f"Unexpected response: {begin}"))
 
-            response = b""
             while True:
-                chunk = sock.recv(4096)
-                if not chunk:
-                    break
-                response += chunk
-                if b"\n" in response:
-                    break
-
-            return json.loads(response.decode().strip())
+                frame = loads(self._read_frame())
+                frame_type = frame.get("type")
+                if frame_type is None:
+                    yield frame
+                elif frame_type == "error":
+                    finished = True
+                    raise RuntimeError(frame["error"])
+                else:
+                    finished = True
+                    return frame
         finally:
-            sock.close()
+            if not finished:
+                # Abandoned mid-stream; the connection can't be reused
+                self.close()
+
+    def close(self) -> None:
+        """Close the connection if open."""
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def _connect(self) -> socket.socket:
+        """Return the open connection, connecting if needed."""
+        if self._sock is None:
+            if not self.socket_path.exists():
+                raise ConnectionError(f"Socket not found: {self.socket_path}")
+
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(str(self.socket_path))
+            except BaseException:
+                sock.close()
+                raise
+            self._sock = sock
+            # Buffered so several frames arriving in one recv aren't lost
+            self._reader = cast(
+                io.BufferedReader, sock.makefile("rb", buffering=RECV_BUFFER_SIZE)
+            )
+
+        return self._sock
+
+    def _read_frame(self) -> bytes:
+        """Read one frame from the connection and return its payload."""
+        if self._reader is None:
+            raise ConnectionError("Not connected to watcher")
+
+        header = self._reader.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE:
+            raise ConnectionError("Watcher closed connection")
+
+        size = decode_header(header)
+        payload = self._reader.read(size)
+        if len(payload) < size:
+            raise ConnectionError("Watcher closed connection mid-message")
+        return payload
@@ -0,0 +1,20 @@
+"""Minimal entry point for printing the shell hook init line.
+
+Runs on every shell start-up, so it must not import the Click CLI or the
+config models.
+"""
+
+from __future__ import annotations
+
+import sys
+
+HOOKS_INIT_LINE = 'source "${TERMRECORD_HOOKS:-@hooks@/hooks.zsh}"\n'
+
+
+def main() -> None:
+    """Print shell hook initialization commands for zsh."""
+    sys.stdout.write(HOOKS_INIT_LINE)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,19 @@ from __future__ import annotations
 
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import click
 
 from termrecord.cli.client import WatcherClient
+from termrecord.cli.hooks_entry import HOOKS_INIT_LINE
 from termrecord.config import load_config
+from termrecord.jsonutil import loads
+from termrecord.storage import iter_files, storage_usage
+
+# Threads used to read metadata files in `search`
+SEARCH_WORKERS = 32
 
 
 @click.group()
@@ -19,14 +26,17 @@ def cli(ctx: click.Context, config: Path | None) -> None:
     """Termrecord - Automatic terminal recording linked to atuin."""
     ctx.ensure_object(dict)
     ctx.obj["config"] = load_config(config)
+    # One connection per invocation, closed when the command finishes
+    ctx.obj["client"] = ctx.with_resource(
+        WatcherClient(ctx.obj["config"].watcher.socket_path)
+    )
 
 
 @cli.command()
 @click.pass_context
 def status(ctx: click.Context) -> None:
     """Show watcher status and recording stats."""
-    config = ctx.obj["config"]
-    client = WatcherClient(config.watcher.socket_path)
+    client = ctx.obj["client"]
 
     try:
         result = client.send({"action": "status"})
@@ -47,14 +57,13 @@ def list_recordings(
     ctx: click.Context, limit: int, failed: bool, cwd: str | None
 ) -> None:
     """List recent recordings."""
-    config = ctx.obj["config"]
-    client = WatcherClient(config.watcher.socket_path)
+    client = ctx.obj["client"]
 
-    result = client.send(
+    recordings = client.stream(
         {"action": "list", "limit": limit, "failed_only": failed, "cwd": cwd}
     )
 
-    for rec in result["recordings"]:
+    for rec in recordings:
         status_icon = "✗" if rec["exit_code"] != 0 else "✓"
         duration = f"{rec['duration']:.1f}s" if rec["duration"] else "?"
         click.echo(f"{status_icon} [{rec['id'][:20]}] {duration} {rec['command'][:60]}")
@@ -67,7 +76,7 @@ def list_recordings(
 def show(ctx: click.Context, recording_id: str, speed: float) -> None:
     """Play a recording."""
     config = ctx.obj["config"]
-    client = WatcherClient(config.watcher.socket_path)
+    client = ctx.obj["client"]
 
     result = client.send({"action": "get", "id": recording_id})
 
@@ -100,7 +109,7 @@ def export(
 ) -> None:
     """Export a recording."""
     config = ctx.obj["config"]
-    client = WatcherClient(config.watcher.socket_path)
+    client = ctx.obj["client"]
 
     result = client.send({"action": "get", "id": recording_id})
 
@@ -159,7 +168,7 @@ def check_path(ctx: click.Context, directory: Path) -> None:
 @cli.command()
 def init_hooks() -> None:
     """Print shell hook initialization commands for zsh."""
-    click.echo('source "${TERMRECORD_HOOKS:-@hooks@/hooks.zsh}"')
+    click.echo(HOOKS_INIT_LINE, nl=False)
 
 
 @cli.command()
@@ -167,8 +176,7 @@ def init_hooks() -> None:
 @click.pass_context
 def cleanup(ctx: click.Context, dry_run: bool) -> None:
     """Run retention cleanup."""
-    config = ctx.obj["config"]
-    client = WatcherClient(config.watcher.socket_path)
+    client = ctx.obj["client"]
 
     result = client.send({"action": "cleanup", "dry_run": dry_run})
 
@@ -185,27 +193,17 @@ def stats(ctx: click.Context) -> None:
     storage_dir = config.recording.storage_dir.expanduser()
     recordings_dir = storage_dir / "recordings"
 
-    total_size = 0
-    total_count = 0
-    cast_size = 0
-    gif_size = 0
-
-    if recordings_dir.exists():
-        for path in recordings_dir.rglob("*"):
-            if path.is_file():
-                size = path.stat().st_size
-                total_size += size
-                if path.suffix == ".cast":
-                    cast_size += size
-                    total_count += 1
-                elif path.suffix == ".gif":
-                    gif_size += size
+    try:
+        usage = ctx.obj["client"].send({"action": "stats"})["stats"]
+    except ConnectionError:
+        # Watcher not running: walk the storage directory instead
+        usage = storage_usage(recordings_dir)
 
     click.echo(f"Storage directory: {storage_dir}")
-    click.echo(f"Total recordings: {total_count}")
-    click.echo(f"Total size: {total_size / 1024 / 1024:.1f} MB")
-    click.echo(f"  Cast files: {cast_size / 1024 / 1024:.1f} MB")
-    click.echo(f"  GIF files: {gif_size / 1024 / 1024:.1f} MB")
+    click.echo(f"Total recordings: {usage['total_count']}")
+    click.echo(f"Total size: {usage['total_size'] / 1024 / 1024:.1f} MB")
+    click.echo(f"  Cast files: {usage['cast_size'] / 1024 / 1024:.1f} MB")
+    click.echo(f"  GIF files: {usage['gif_size'] / 1024 / 1024:.1f} MB")
 
 
 @cli.command()
@@ -214,25 +212,19 @@ def stats(ctx: click.Context) -> None:
 def search(ctx: click.Context, query: str) -> None:
     """Search recordings by command text."""
     config = ctx.obj["config"]
-    storage_dir = config.recording.storage_dir.expanduser()
-    recordings_dir = storage_dir / "recordings"
-
-    if not recordings_dir.exists():
-        click.echo("No recordings found")
-        return
-
-    matches = []
-    for meta_file in recordings_dir.rglob("*.meta.json"):
-        import json
+    client = ctx.obj["client"]
 
-        with open(meta_file) as f:
-            meta = json.load(f)
-            if query.lower() in meta.get("command", "").lower():
-                matches.append(meta)
-
-    matches.sort(key=lambda x: x["timestamp"], reverse=True)
-
-    for meta in matches[:20]:
+    try:
+        matches = client.send({"action": "search", "query": query, "limit": 20})["recordings"]
+    except ConnectionError:
+        # Watcher not running: scan metadata files directly
+        recordings_dir = config.recording.storage_dir.expanduser() / "recordings"
+        if not recordings_dir.exists():
+            click.echo("No recordings found")
+            return
+        matches = search_metadata_files(recordings_dir, query)[:20]
+
+    for meta in matches:
         status_icon = "✗" if meta.get("exit_code", 0) != 0 else "✓"
         duration = (
             f"{meta['duration']:.1f}s" if meta.get("duration") else "?"
@@ -242,6 +234,41 @@ def search(ctx: click.Context, query: str) -> None:
         )
 
 
+def search_metadata_files(recordings_dir: Path, query: str) -> list[dict]:
+    """Scan .meta.json files for commands containing query, newest first."""
+    needle = query.lower()
+    # Most files don't match, so reject them on the raw bytes before parsing.
+    # Only safe when the query can't appear JSON-escaped in the file.
+    raw_needle = (
+        needle.encode()
+        if needle.isascii() and needle.isprintable() and not {'"', "\\"} & set(needle)
+        else None
+    )
+
+    def load_match(meta_file: str) -> dict | None:
+        with open(meta_file, "rb") as f:
+            raw = f.read()
+        if raw_needle is not None and raw_needle not in raw.lower():
+            return None
+        meta = loads(raw)
+        if needle in meta.get("command", "").lower():
+            return meta
+        return None
+
+    meta_files = [
+        entry.path
+        for entry in iter_files(recordings_dir)
+        if entry.name.endswith(".meta.json")
+    ]
+
+    # Reads are I/O bound, so overlap them; results are sorted afterwards.
+    with ThreadPoolExecutor(max_workers=SEARCH_WORKERS) as pool:
+        matches = [meta for meta in pool.map(load_match, meta_files) if meta is not None]
+
+    matches.sort(key=lambda x: x["timestamp"], reverse=True)
+    return matches
+
+
 def main() -> None:
     """Main entry point."""
     cli()
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
-import fnmatch
+import functools
+import os
 import sys
+import time
 from pathlib import Path
 
 try:
@@ -13,6 +15,9 @@ except ImportError:
 
 from termrecord.models.config import Config
 
+# Seconds a find_dotfile result may be reused before walking the tree again
+DOTFILE_CACHE_TTL = 5.0
+
 
 def load_config(config_path: Path | None = None) -> Config:
     """Load configuration from file."""
@@ -21,25 +26,43 @@ def load_config(config_path: Path | None = None) -> Config:
     else:
         config_path = Path(config_path).expanduser()
 
-    if not config_path.exists():
+    try:
+        mtime_ns = config_path.stat().st_mtime_ns
+    except FileNotFoundError:
         return Config()
 
-    with open(config_path, "rb") as f:
+    return _load_config_file(str(config_path), mtime_ns)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_config_file(path: str, mtime_ns: int) -> Config:
+    """Parse a config file. Keyed on mtime so edits invalidate the cache."""
+    with open(path, "rb") as f:
         data = tomllib.load(f)
 
     return Config.model_validate(data)
 
 
 def find_dotfile(start_dir: Path) -> Path | None:
-    """Find .termrecord.toml walking up from start_dir."""
-    current = start_dir.resolve()
+    """Find .termrecord.toml walking up from start_dir.
+
+    Results are cached per directory for up to DOTFILE_CACHE_TTL seconds.
+    """
+    ttl_bucket = int(time.monotonic() // DOTFILE_CACHE_TTL)
+    return _find_dotfile_cached(str(start_dir.resolve()), ttl_bucket)
+
+
+@functools.lru_cache(maxsize=1024)
+def _find_dotfile_cached(directory: str, ttl_bucket: int) -> Path | None:
+    """Walk up from directory. ttl_bucket only serves to expire cache entries."""
+    current = directory
 
     while True:
-        dotfile = current / ".termrecord.toml"
-        if dotfile.exists():
-            return dotfile
+        dotfile = os.path.join(current, ".termrecord.toml")
+        if os.path.isfile(dotfile):
+            return Path(dotfile)
 
-        parent = current.parent
+        parent = os.path.dirname(current)
         if parent == current:  # Reached root
             break
         current = parent
@@ -49,7 +72,14 @@ def find_dotfile(start_dir: Path) -> Path | None:
 
 def is_recording_enabled_dotfile(dotfile_path: Path) -> bool:
     """Check if recording is enabled in dotfile."""
-    with open(dotfile_path, "rb") as f:
+    mtime_ns = dotfile_path.stat().st_mtime_ns
+    return _dotfile_enabled(str(dotfile_path), mtime_ns)
+
+
+@functools.lru_cache(maxsize=256)
+def _dotfile_enabled(path: str, mtime_ns: int) -> bool:
+    """Parse a dotfile's enabled flag. Keyed on mtime so edits invalidate the cache."""
+    with open(path, "rb") as f:
         data = tomllib.load(f)
 
     return data.get("enabled", True)
@@ -57,16 +87,16 @@ def is_recording_enabled_dotfile(dotfile_path: Path) -> bool:
 
 def is_recording_enabled_rules(config: Config, directory: Path) -> bool | None:
     """Check path rules. Returns None if no rule matches."""
-    dir_str = str(directory.expanduser().resolve())
+    rules_regex = config.recording.rules_regex
+    if rules_regex is None:
+        return None
 
-    for rule in config.recording.rules:
-        pattern = str(Path(rule.path).expanduser())
+    # First matching rule wins, as regex alternation is tried left to right
+    match = rules_regex.match(str(directory.expanduser().resolve()))
+    if match is None:
+        return None
 
-        # Handle glob patterns
-        if fnmatch.fnmatch(dir_str, pattern):
-            return rule.enabled
-
-    return None
+    return config.recording.rules[int(match.lastgroup[1:])].enabled
 
 
 def is_recording_enabled(config: Config, directory: Path) -> bool:
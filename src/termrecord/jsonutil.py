@@ -0,0 +1,34 @@
+"""JSON encoding helpers.
+
+Uses orjson when it is installed and falls back to the standard library.
+Both variants encode to and decode from UTF-8 bytes.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    import json
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize obj to JSON bytes."""
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    def loads(data: bytes | bytearray | memoryview | str) -> Any:
+        """Deserialize JSON from bytes or str."""
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+else:
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize obj to JSON bytes."""
+        return orjson.dumps(obj)
+
+    def loads(data: bytes | bytearray | memoryview | str) -> Any:
+        """Deserialize JSON from bytes or str."""
+        return orjson.loads(data)
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import fnmatch
+import re
+from functools import cached_property
 from pathlib import Path
 from typing import Literal
 
@@ -24,6 +27,20 @@ class RecordingConfig(BaseModel):
     format: Literal["cast", "gif", "both"] = "cast"
     rules: list[PathRule] = Field(default_factory=list)
 
+    @cached_property
+    def rules_regex(self) -> re.Pattern[str] | None:
+        """All rule globs as one regex; named group ``r<N>`` matches ``rules[N]``."""
+        if not self.rules:
+            return None
+
+        parts = []
+        for i, rule in enumerate(self.rules):
+            pattern = fnmatch.translate(str(Path(rule.path).expanduser()))
+            # fnmatch may emit named groups; keep them unique across rules
+            pattern = pattern.replace("(?P<g", f"(?P<r{i}g").replace("(?P=g", f"(?P=r{i}g")
+            parts.append(f"(?P<r{i}>{pattern})")
+        return re.compile("|".join(parts))
+
 
 class RetentionConfig(BaseModel):
     """Retention policy configuration."""
@@ -25,29 +25,19 @@ class IndexedRecording(BaseModel):
     screenshot_path: str | None
     meta_path: str
     indexed_at: int
+    size_bytes: int = 0
+    cast_bytes: int = 0
+    gif_bytes: int = 0
 
     @classmethod
     def from_row(cls, row: Any) -> IndexedRecording:
-        """Create from database row."""
-        # Handle both dict and tuple rows
-        if isinstance(row, dict):
-            return cls(**row)
-
-        # Assume tuple from sqlite3.Row or similar
-        return cls(
-            id=row[0],
-            atuin_id=row[1],
-            command=row[2],
-            timestamp=row[3],
-            duration=row[4],
-            exit_code=row[5],
-            cwd=row[6],
-            shell=row[7],
-            user=row[8],
-            hostname=row[9],
-            cast_path=row[10],
-            gif_path=row[11],
-            screenshot_path=row[12],
-            meta_path=row[13],
-            indexed_at=row[14],
-        )
+        """Create from database row.
+
+        Accepts a plain tuple in column order, or anything with keys() and
+        lookup by column name, such as a dict or sqlite3.Row. Rows come from
+        our own schema, so validation is skipped.
+        """
+        if isinstance(row, tuple):
+            return cls.model_construct(**dict(zip(cls.model_fields, row)))
+
+        return cls.model_construct(**row)
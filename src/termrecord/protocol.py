@@ -0,0 +1,19 @@
+"""Watcher socket framing.
+
+Every message on the watcher socket is a 4-byte big-endian length header
+followed by that many bytes of JSON.
+"""
+
+from __future__ import annotations
+
+HEADER_SIZE = 4
+
+
+def encode_frame(payload: bytes) -> bytes:
+    """Prefix payload with its length header."""
+    return len(payload).to_bytes(HEADER_SIZE, "big") + payload
+
+
+def decode_header(header: bytes) -> int:
+    """Return the payload length encoded in a frame header."""
+    return int.from_bytes(header, "big")
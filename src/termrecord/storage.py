@@ -0,0 +1,96 @@
+"""Recording storage helpers."""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+
+def iter_files(directory: Path | str) -> Iterator[os.DirEntry[str]]:
+    """Recursively yield file entries below directory.
+
+    Uses os.scandir so file type checks come from the directory listing
+    instead of a stat() per path.
+    """
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_files(entry.path)
+            elif entry.is_file():
+                yield entry
+
+
+def storage_usage(recordings_dir: Path) -> dict:
+    """Count recordings and sum file sizes by type under recordings_dir.
+
+    Each file costs a single stat (cached on its DirEntry); types are told
+    apart by name suffix.
+    """
+    total_size = 0
+    total_count = 0
+    cast_size = 0
+    gif_size = 0
+
+    if recordings_dir.exists():
+        for entry in iter_files(recordings_dir):
+            size = entry.stat().st_size
+            total_size += size
+            name = entry.name
+            if name.endswith(".cast"):
+                cast_size += size
+                total_count += 1
+            elif name.endswith(".gif"):
+                gif_size += size
+
+    return {
+        "total_count": total_count,
+        "total_size": total_size,
+        "cast_size": cast_size,
+        "gif_size": gif_size,
+    }
+
+
+def scan_recording_files(
+    meta_paths: Iterable[Path | str],
+) -> dict[str, list[os.DirEntry[str]]]:
+    """Map each metadata path to entries for all files of its recording.
+
+    A recording's cast, exports and metadata live in one directory and are
+    named after the recording ID, which contains no dots. Each distinct
+    directory is listed once and its files grouped by ID, so a batch costs
+    one scandir per directory rather than one per recording.
+    """
+    by_directory: dict[str, list[str]] = {}
+    for meta_path in meta_paths:
+        meta_path = os.fspath(meta_path)
+        by_directory.setdefault(os.path.dirname(meta_path), []).append(meta_path)
+
+    files: dict[str, list[os.DirEntry[str]]] = {}
+    for directory, paths in by_directory.items():
+        groups: dict[str, list[os.DirEntry[str]]] = {}
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_file():
+                        groups.setdefault(entry.name.partition(".")[0], []).append(entry)
+        except FileNotFoundError:
+            pass
+
+        for meta_path in paths:
+            recording_id = os.path.basename(meta_path).removesuffix(".meta.json")
+            files[meta_path] = groups.get(recording_id, [])
+    return files
+
+
+def recording_sizes(entries: Iterable[os.DirEntry[str]]) -> tuple[int, int, int]:
+    """Return (total, cast, gif) sizes in bytes of a recording's file entries."""
+    total = cast = gif = 0
+    for entry in entries:
+        size = entry.stat().st_size
+        total += size
+        if entry.name.endswith(".cast"):
+            cast += size
+        elif entry.name.endswith(".gif"):
+            gif += size
+    return total, cast, gif
@@ -3,12 +3,16 @@
 from __future__ import annotations
 
 import asyncio
+import logging
+import os
 import time
-from pathlib import Path
 
 from termrecord.models.config import Config
+from termrecord.storage import scan_recording_files
 from termrecord.watcher.indexer import Indexer
 
+logger = logging.getLogger(__name__)
+
 
 class CleanupScheduler:
     """Handles retention cleanup."""
@@ -19,6 +23,8 @@ class CleanupScheduler:
         self.storage_dir = config.recording.storage_dir.expanduser()
         self._task: asyncio.Task | None = None
         self._stop_event = asyncio.Event()
+        # Serializes scheduled runs with ones requested over the socket
+        self._lock = asyncio.Lock()
 
     async def start(self) -> None:
         """Start cleanup scheduler."""
@@ -48,89 +54,67 @@ class CleanupScheduler:
                 await asyncio.sleep(3600)  # Retry in an hour on error
 
     async def run_cleanup(self, dry_run: bool = False) -> dict:
-        """Run cleanup now."""
-        deleted_count = 0
-        freed_bytes = 0
+        """Run cleanup now, after any run already in progress."""
+        async with self._lock:
+            return await self._run_cleanup(dry_run)
+
+    async def _run_cleanup(self, dry_run: bool) -> dict:
+        """Apply the retention policies."""
+        # Index rows are removed pass by pass; files are deleted together at the end.
+        # Keyed by ID so a recording selected by several passes counts once.
+        expired: dict[str, str] = {}
 
         # 1. Delete by age
         max_age_seconds = self.config.retention.max_age_days * 86400
         cutoff = time.time() - max_age_seconds
-
-        async with self.indexer._db.execute(
-            "SELECT id, meta_path FROM recordings WHERE timestamp < ?", (cutoff,)
-        ) as cursor:
-            async for row in cursor:
-                recording_id, meta_path = row
-                if not dry_run:
-                    freed = await self._delete_recording_files(recording_id, meta_path)
-                    freed_bytes += freed
-                deleted_count += 1
+        expired.update(await self.indexer.purge_older_than(cutoff, dry_run=dry_run))
 
         # 2. Delete by count (keep newest)
-        max_count = self.config.retention.max_count
-        async with self.indexer._db.execute(
-            """
-            SELECT id, meta_path FROM recordings
-            ORDER BY timestamp DESC
-            LIMIT -1 OFFSET ?
-        """,
-            (max_count,),
-        ) as cursor:
-            async for row in cursor:
-                recording_id, meta_path = row
-                if not dry_run:
-                    freed = await self._delete_recording_files(recording_id, meta_path)
-                    freed_bytes += freed
-                deleted_count += 1
+        expired.update(
+            await self.indexer.purge_beyond_count(
+                self.config.retention.max_count, dry_run=dry_run
+            )
+        )
 
         # 3. Delete by size (oldest first until under limit)
-        max_bytes = self.config.retention.max_size_gb * 1024 * 1024 * 1024
-        current_size = await self._calculate_storage_size()
+        max_bytes = int(self.config.retention.max_size_gb * 1024 * 1024 * 1024)
+        current_size = await self.indexer.get_total_size()
 
         if current_size > max_bytes:
-            async with self.indexer._db.execute(
-                "SELECT id, meta_path FROM recordings ORDER BY timestamp ASC"
-            ) as cursor:
-                async for row in cursor:
-                    if current_size <= max_bytes:
-                        break
-                    recording_id, meta_path = row
-                    if not dry_run:
-                        freed = await self._delete_recording_files(
-                            recording_id, meta_path
-                        )
-                        freed_bytes += freed
-                        current_size -= freed
-                    deleted_count += 1
-
-        return {"deleted_count": deleted_count, "freed_bytes": freed_bytes}
-
-    async def _delete_recording_files(
-        self, recording_id: str, meta_path: str
-    ) -> int:
-        """Delete recording files and index entry."""
-        freed = 0
-        meta = Path(meta_path)
-
-        if meta.exists():
-            freed += meta.stat().st_size
-            meta.unlink()
-
-        # Delete associated files
-        for suffix in [".cast", ".gif", ".png"]:
-            associated = meta.with_suffix(suffix)
-            if associated.exists():
-                freed += associated.stat().st_size
-                associated.unlink()
-
-        await self.indexer.delete_recording(recording_id)
-        return freed
-
-    async def _calculate_storage_size(self) -> int:
-        """Calculate total storage size."""
-        recordings_dir = self.storage_dir / "recordings"
-        total = 0
-        for path in recordings_dir.rglob("*"):
-            if path.is_file():
-                total += path.stat().st_size
-        return total
+            expired.update(
+                await self.indexer.purge_oldest_bytes(
+                    current_size - max_bytes, dry_run=dry_run
+                )
+            )
+
+        files = await asyncio.to_thread(scan_recording_files, expired.values())
+        freed = await asyncio.gather(
+            *(
+                asyncio.to_thread(_delete_recording_files, entries, dry_run)
+                for entries in files.values()
+            )
+        )
+        return {"deleted_count": len(expired), "freed_bytes": sum(freed)}
+
+
+def _delete_recording_files(
+    entries: list[os.DirEntry[str]], dry_run: bool = False
+) -> int:
+    """Delete a recording's files. Returns bytes freed (or that would be freed).
+
+    The index row is already gone, so a file that can't be removed is logged
+    and skipped rather than failing the rest of the run.
+    """
+    freed = 0
+    for entry in entries:
+        try:
+            size = entry.stat().st_size
+            if not dry_run:
+                os.unlink(entry.path)
+        except FileNotFoundError:
+            continue
+        except OSError as e:
+            logger.error(f"Failed to delete {entry.path}: {e}")
+            continue
+        freed += size
+    return freed
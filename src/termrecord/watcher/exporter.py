@@ -6,7 +6,7 @@ import asyncio
 from pathlib import Path
 
 from termrecord.models.config import Config
-from termrecord.watcher.indexer import Indexer
+from termrecord.watcher.indexer import INSERT_EXPORT_SQL, Indexer
 
 
 class ExportQueue:
@@ -35,14 +35,8 @@ class ExportQueue:
 
     async def enqueue(self, recording_id: str, export_type: str) -> None:
         """Add export job to queue."""
-        await self.indexer._db.execute(
-            """
-            INSERT INTO export_queue (recording_id, export_type, status)
-            VALUES (?, ?, 'pending')
-        """,
-            (recording_id, export_type),
-        )
-        await self.indexer._db.commit()
+        async with self.indexer.write_transaction() as db:
+            await db.execute(INSERT_EXPORT_SQL, (recording_id, export_type))
 
     async def _process_loop(self) -> None:
         """Main processing loop."""
@@ -57,33 +51,46 @@ class ExportQueue:
 
     async def _process_next(self) -> None:
         """Process next item in queue."""
-        async with self.indexer._db.execute(
+        async with self.indexer.write_transaction() as db:
+            async with db.execute(
+                """
+                SELECT eq.id, eq.recording_id, eq.export_type, r.cast_path
+                FROM export_queue eq
+                JOIN recordings r ON eq.recording_id = r.id
+                WHERE eq.status = 'pending'
+                ORDER BY eq.created_at
+                LIMIT 1
             """
-            SELECT eq.id, eq.recording_id, eq.export_type, r.cast_path
-            FROM export_queue eq
-            JOIN recordings r ON eq.recording_id = r.id
-            WHERE eq.status = 'pending'
-            ORDER BY eq.created_at
-            LIMIT 1
-        """
-        ) as cursor:
-            row = await cursor.fetchone()
-
-        if not row:
-            return
+            ) as cursor:
+                row = await cursor.fetchone()
 
-        queue_id, recording_id, export_type, cast_path = row
+            if not row:
+                return
 
-        await self.indexer._db.execute(
-            "UPDATE export_queue SET status = 'processing' WHERE id = ?", (queue_id,)
-        )
-        await self.indexer._db.commit()
+            queue_id, recording_id, export_type, cast_path = row
+            await db.execute(
+                "UPDATE export_queue SET status = 'processing' WHERE id = ?", (queue_id,)
+            )
 
+        # The GIF is generated outside any transaction so other writers
+        # aren't held up
         try:
             if export_type == "gif":
                 await self._generate_gif(recording_id, cast_path)
+        except Exception as e:
+            async with self.indexer.write_transaction() as db:
+                await db.execute(
+                    """
+                    UPDATE export_queue
+                    SET status = 'failed', error = ?
+                    WHERE id = ?
+                """,
+                    (str(e), queue_id),
+                )
+            return
 
-            await self.indexer._db.execute(
+        async with self.indexer.write_transaction() as db:
+            await db.execute(
                 """
                 UPDATE export_queue
                 SET status = 'done', completed_at = strftime('%s', 'now')
@@ -91,17 +98,6 @@ class ExportQueue:
             """,
                 (queue_id,),
             )
-        except Exception as e:
-            await self.indexer._db.execute(
-                """
-                UPDATE export_queue
-                SET status = 'failed', error = ?
-                WHERE id = ?
-            """,
-                (str(e), queue_id),
-            )
-
-        await self.indexer._db.commit()
 
     async def _generate_gif(self, recording_id: str, cast_path: str) -> None:
         """Generate GIF from cast file."""
@@ -127,7 +123,13 @@ class ExportQueue:
 
         # Update recording with gif path
         relative_gif = str(gif_path.relative_to(self.storage_dir / "recordings"))
-        await self.indexer._db.execute(
-            "UPDATE recordings SET gif_path = ? WHERE id = ?", (relative_gif, recording_id)
-        )
-        await self.indexer._db.commit()
+        gif_size = gif_path.stat().st_size
+        async with self.indexer.write_transaction() as db:
+            await db.execute(
+                """
+                UPDATE recordings
+                SET gif_path = ?, size_bytes = size_bytes - gif_bytes + ?, gif_bytes = ?
+                WHERE id = ?
+            """,
+                (relative_gif, gif_size, gif_size, recording_id),
+            )
@@ -2,12 +2,157 @@
 
 from __future__ import annotations
 
-import aiosqlite
+import asyncio
+import logging
+import mmap
+import os
+import threading
+from collections.abc import AsyncGenerator, AsyncIterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import AsyncIterator
+from typing import Any
+
+import aiosqlite
 
+from termrecord.jsonutil import dumps, loads
 from termrecord.models.index import IndexedRecording
-from termrecord.models.metadata import RecordingMetadata
+from termrecord.storage import recording_sizes, scan_recording_files
+
+logger = logging.getLogger(__name__)
+
+# Per-recording byte counts, added to the schema after its first release
+SIZE_COLUMNS = ("size_bytes", "cast_bytes", "gif_bytes")
+
+# Connection settings. WAL lets readers proceed while the watcher writes, and
+# synchronous=NORMAL is crash-safe under WAL without an fsync per commit.
+CONNECTION_PRAGMAS = """
+    PRAGMA journal_mode = WAL;
+    PRAGMA synchronous = NORMAL;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA cache_size = -65536;
+    PRAGMA mmap_size = 268435456;
+    PRAGMA busy_timeout = 5000;
+"""
+
+# Sorts after any path that starts with a given prefix
+CWD_PREFIX_END = "\U0010ffff"
+
+# A cwd prefix matching at most this many recordings is listed through
+# idx_cwd and sorted by time. Broader prefixes are listed by scanning
+# idx_ts_id in time order and filtering, which stops once the page is full.
+CWD_SORT_MAX_ROWS = 1000
+
+# Metadata files up to this size are read into a reused per-thread buffer;
+# larger ones are memory-mapped
+SMALL_FILE_SIZE = 65536
+
+# Threads parsing metadata files during bulk indexing
+READ_WORKERS = 4
+
+# Read-only connections serving queries alongside the single writer
+READ_CONNECTIONS = 4
+
+# Prepared statements kept per connection (sqlite3 defaults to 128)
+STATEMENT_CACHE_SIZE = 256
+
+# Keyed by the recording ID alone; lookups by id need no separate index.
+# fts_rowid gives the search index the integer key FTS5 requires.
+RECORDINGS_TABLE_DDL = """(
+    id TEXT PRIMARY KEY,
+    atuin_id TEXT UNIQUE,
+    command TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    duration REAL,
+    exit_code INTEGER,
+    cwd TEXT NOT NULL,
+    shell TEXT,
+    user TEXT,
+    hostname TEXT,
+    cast_path TEXT,
+    gif_path TEXT,
+    screenshot_path TEXT,
+    meta_path TEXT NOT NULL,
+    indexed_at INTEGER NOT NULL DEFAULT (strftime('%s', 'now')),
+    size_bytes INTEGER NOT NULL DEFAULT 0,
+    cast_bytes INTEGER NOT NULL DEFAULT 0,
+    gif_bytes INTEGER NOT NULL DEFAULT 0,
+    fts_rowid INTEGER NOT NULL
+) WITHOUT ROWID"""
+
+# Columns returned to callers; fts_rowid only links rows to the search index
+RECORDING_COLUMNS = ", ".join(IndexedRecording.model_fields)
+
+# Columns the CLI list view needs, including the paging cursor
+SUMMARY_COLUMNS = "id, command, timestamp, duration, exit_code, cwd"
+
+# Hot-path statements, kept as constants so each is prepared once and then
+# served from the connection's statement cache
+#
+# Re-indexing updates the existing row in place, so indexed_at is kept and
+# triggers see an UPDATE rather than a DELETE and INSERT. atuin_id is
+# UNIQUE: a new recording whose atuin_id already belongs to another one is
+# skipped, and a re-indexed one keeps its current atuin_id, so neither
+# fails the whole batch.
+INSERT_RECORDING_SQL = """
+    INSERT INTO recordings (
+        id, atuin_id, command, timestamp, duration, exit_code,
+        cwd, shell, user, hostname, cast_path, gif_path,
+        screenshot_path, meta_path, size_bytes, cast_bytes, gif_bytes, fts_rowid
+    ) VALUES (
+        ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+        (SELECT COALESCE(MAX(fts_rowid), 0) + 1 FROM recordings)
+    )
+    ON CONFLICT(id) DO UPDATE SET
+        atuin_id = CASE
+            WHEN EXISTS (
+                SELECT 1 FROM recordings AS other
+                WHERE other.atuin_id = excluded.atuin_id AND other.id != excluded.id
+            ) THEN recordings.atuin_id
+            ELSE excluded.atuin_id
+        END,
+        command = excluded.command,
+        timestamp = excluded.timestamp,
+        duration = excluded.duration,
+        exit_code = excluded.exit_code,
+        cwd = excluded.cwd,
+        shell = excluded.shell,
+        user = excluded.user,
+        hostname = excluded.hostname,
+        cast_path = excluded.cast_path,
+        gif_path = excluded.gif_path,
+        screenshot_path = excluded.screenshot_path,
+        meta_path = excluded.meta_path,
+        size_bytes = excluded.size_bytes,
+        cast_bytes = excluded.cast_bytes,
+        gif_bytes = excluded.gif_bytes
+    ON CONFLICT DO NOTHING
+"""
+# Which of a batch of IDs (passed as a JSON array) are in the table
+SELECT_EXISTING_IDS_SQL = """
+    SELECT id FROM recordings WHERE id IN (SELECT value FROM json_each(?))
+"""
+INSERT_EXPORT_SQL = """
+    INSERT INTO export_queue (recording_id, export_type, status)
+    VALUES (?, ?, 'pending')
+"""
+
+COUNT_CWD_SQL = (
+    "SELECT COUNT(*) FROM (SELECT 1 FROM recordings WHERE cwd >= ? AND cwd < ? LIMIT ?)"
+)
+
+SELECT_BY_ID_SQL = f"SELECT {RECORDING_COLUMNS} FROM recordings WHERE id = ?"
+SELECT_BY_ATUIN_ID_SQL = f"SELECT {RECORDING_COLUMNS} FROM recordings WHERE atuin_id = ?"
+SEARCH_FTS_SQL = f"""
+    SELECT {RECORDING_COLUMNS} FROM recordings WHERE fts_rowid IN (
+        SELECT rowid FROM recordings_fts WHERE recordings_fts MATCH ?
+    )
+    ORDER BY timestamp DESC LIMIT ?
+"""
+SEARCH_SCAN_SQL = f"""
+    SELECT {RECORDING_COLUMNS} FROM recordings WHERE instr(lower(command), lower(?)) > 0
+    ORDER BY timestamp DESC LIMIT ?
+"""
 
 
 class Indexer:
@@ -15,44 +160,93 @@ class Indexer:
 
     def __init__(self, db_path: Path):
         self.db_path = db_path
-        self._db: aiosqlite.Connection | None = None
+        self._write_db: aiosqlite.Connection | None = None
+        self._read_pool: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        # Held for each transaction on the shared write connection, so one
+        # caller's commit can't include another's uncommitted writes
+        self._write_lock = asyncio.Lock()
+        self._parse_pool = ThreadPoolExecutor(
+            max_workers=READ_WORKERS, thread_name_prefix="termrecord-read"
+        )
 
     async def initialize(self) -> None:
-        """Initialize database connection and schema."""
-        self._db = await aiosqlite.connect(self.db_path)
-        self._db.row_factory = aiosqlite.Row
-        await self._create_schema()
+        """Open the write connection, create the schema, then open readers.
+
+        Under WAL the readers see each committed write without waiting on
+        the writer, so queries don't stall indexing and vice versa.
+        """
+        self._write_db = await self._connect()
+        await self._create_schema(self._write_db)
+
+        for _ in range(READ_CONNECTIONS):
+            db = await self._connect()
+            await db.execute("PRAGMA query_only = ON")
+            self._read_pool.put_nowait(db)
+
+    async def _connect(self) -> aiosqlite.Connection:
+        """Open a connection with the shared settings."""
+        db = await aiosqlite.connect(
+            self.db_path, cached_statements=STATEMENT_CACHE_SIZE
+        )
+        db.row_factory = aiosqlite.Row
+        await db.executescript(CONNECTION_PRAGMAS)
+        return db
+
+    @asynccontextmanager
+    async def _acquire_read(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Check out a read connection, waiting if all are in use."""
+        db = await self._read_pool.get()
+        try:
+            yield db
+        finally:
+            self._read_pool.put_nowait(db)
+
+    @asynccontextmanager
+    async def write_transaction(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Run writes on the write connection as one transaction.
+
+        Commits when the block exits normally and rolls back if it raises.
+        """
+        db = self._write_db
+        if db is None:
+            raise RuntimeError("Indexer is not initialized")
+
+        async with self._write_lock:
+            try:
+                yield db
+            except BaseException:
+                await db.rollback()
+                raise
+            await db.commit()
 
     async def close(self) -> None:
-        """Close database connection."""
-        if self._db:
-            await self._db.close()
+        """Close database connections."""
+        while not self._read_pool.empty():
+            await self._read_pool.get_nowait().close()
+        if self._write_db:
+            await self._write_db.close()
+        self._parse_pool.shutdown(wait=False, cancel_futures=True)
 
-    async def _create_schema(self) -> None:
+    async def _create_schema(self, db: aiosqlite.Connection) -> None:
         """Create database schema."""
-        await self._db.executescript("""
-            CREATE TABLE IF NOT EXISTS recordings (
-                id TEXT PRIMARY KEY,
-                atuin_id TEXT UNIQUE,
-                command TEXT NOT NULL,
-                timestamp REAL NOT NULL,
-                duration REAL,
-                exit_code INTEGER,
-                cwd TEXT NOT NULL,
-                shell TEXT,
-                user TEXT,
-                hostname TEXT,
-                cast_path TEXT,
-                gif_path TEXT,
-                screenshot_path TEXT,
-                meta_path TEXT NOT NULL,
-                indexed_at INTEGER NOT NULL DEFAULT (strftime('%s', 'now'))
-            );
+        await self._migrate_size_columns(db)
+        await self._migrate_without_rowid(db)
+
+        async with db.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'recordings_fts'"
+        ) as cursor:
+            has_fts = await cursor.fetchone() is not None
 
+        await db.executescript(f"""
+            CREATE TABLE IF NOT EXISTS recordings {RECORDINGS_TABLE_DDL};
+
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_fts_rowid ON recordings(fts_rowid);
             CREATE INDEX IF NOT EXISTS idx_atuin_id ON recordings(atuin_id);
-            CREATE INDEX IF NOT EXISTS idx_timestamp ON recordings(timestamp DESC);
+            DROP INDEX IF EXISTS idx_timestamp;
+            CREATE INDEX IF NOT EXISTS idx_ts_id ON recordings(timestamp DESC, id DESC);
             CREATE INDEX IF NOT EXISTS idx_exit_code ON recordings(exit_code);
-            CREATE INDEX IF NOT EXISTS idx_cwd ON recordings(cwd);
+            DROP INDEX IF EXISTS idx_cwd_ts;
+            CREATE INDEX IF NOT EXISTS idx_cwd ON recordings(cwd COLLATE BINARY);
 
             CREATE TABLE IF NOT EXISTS export_queue (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -71,103 +265,471 @@ class Indexer:
                 value TEXT NOT NULL,
                 updated_at INTEGER NOT NULL DEFAULT (strftime('%s', 'now'))
             );
+
+            -- Row counters kept in state by triggers, so status needs no COUNT(*) scan
+            INSERT OR IGNORE INTO state (key, value)
+                SELECT 'total_count', COUNT(*) FROM recordings;
+            INSERT OR IGNORE INTO state (key, value)
+                SELECT 'failed_count', COUNT(*) FROM recordings WHERE exit_code != 0;
+
+            CREATE TRIGGER IF NOT EXISTS recordings_count_ai AFTER INSERT ON recordings BEGIN
+                UPDATE state SET value = CAST(value AS INTEGER) + 1,
+                    updated_at = strftime('%s', 'now')
+                WHERE key = 'total_count' OR (key = 'failed_count' AND new.exit_code != 0);
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS recordings_count_ad AFTER DELETE ON recordings BEGIN
+                UPDATE state SET value = CAST(value AS INTEGER) - 1,
+                    updated_at = strftime('%s', 'now')
+                WHERE key = 'total_count' OR (key = 'failed_count' AND old.exit_code != 0);
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS recordings_count_au
+            AFTER UPDATE OF exit_code ON recordings BEGIN
+                UPDATE state SET value = CAST(value AS INTEGER)
+                    + ((new.exit_code != 0) IS 1) - ((old.exit_code != 0) IS 1),
+                    updated_at = strftime('%s', 'now')
+                WHERE key = 'failed_count';
+            END;
+
+            -- recordings has no rowid, so the search index is keyed by fts_rowid
+            CREATE VIRTUAL TABLE IF NOT EXISTS recordings_fts USING fts5(
+                command, content='recordings', content_rowid='fts_rowid', tokenize='trigram'
+            );
+
+            CREATE TRIGGER IF NOT EXISTS recordings_fts_ai AFTER INSERT ON recordings BEGIN
+                INSERT INTO recordings_fts(rowid, command) VALUES (new.fts_rowid, new.command);
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS recordings_fts_ad AFTER DELETE ON recordings BEGIN
+                INSERT INTO recordings_fts(recordings_fts, rowid, command)
+                VALUES ('delete', old.fts_rowid, old.command);
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS recordings_fts_au
+            AFTER UPDATE OF command ON recordings BEGIN
+                INSERT INTO recordings_fts(recordings_fts, rowid, command)
+                VALUES ('delete', old.fts_rowid, old.command);
+                INSERT INTO recordings_fts(rowid, command) VALUES (new.fts_rowid, new.command);
+            END;
         """)
-        await self._db.commit()
 
-    async def index_recording(self, meta_path: Path) -> None:
-        """Index a recording from its metadata file."""
-        content = meta_path.read_text()
-        meta = RecordingMetadata.model_validate_json(content)
+        if not has_fts:
+            # Index rows that predate the search table
+            await db.execute(
+                "INSERT INTO recordings_fts(recordings_fts) VALUES ('rebuild')"
+            )
 
-        await self._db.execute(
-            """
-            INSERT OR REPLACE INTO recordings (
-                id, atuin_id, command, timestamp, duration, exit_code,
-                cwd, shell, user, hostname, cast_path, gif_path,
-                screenshot_path, meta_path
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-            (
-                meta.id,
-                meta.atuin_id,
-                meta.command,
-                meta.timestamp,
-                meta.duration,
-                meta.exit_code,
-                meta.cwd,
-                meta.shell,
-                meta.user,
-                meta.hostname,
-                meta.files.cast,
-                meta.files.gif,
-                meta.files.screenshot,
-                str(meta_path),
-            ),
+        await db.commit()
+
+    async def _migrate_size_columns(self, db: aiosqlite.Connection) -> None:
+        """Add and backfill the size columns on databases that predate them."""
+        async with db.execute("PRAGMA table_info(recordings)") as cursor:
+            columns = {row[1] async for row in cursor}
+
+        missing = [c for c in SIZE_COLUMNS if c not in columns]
+        if not columns or not missing:
+            return
+
+        for column in missing:
+            await db.execute(
+                f"ALTER TABLE recordings ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0"
+            )
+        async with db.execute("SELECT id, meta_path FROM recordings") as cursor:
+            rows = [(row[0], row[1]) async for row in cursor]
+
+        def read_sizes() -> list[tuple]:
+            files = scan_recording_files(meta_path for _, meta_path in rows)
+            return [(*recording_sizes(files[meta_path]), rid) for rid, meta_path in rows]
+
+        sizes = await asyncio.to_thread(read_sizes)
+        await db.executemany(
+            "UPDATE recordings SET size_bytes = ?, cast_bytes = ?, gif_bytes = ? WHERE id = ?",
+            sizes,
         )
-        await self._db.commit()
+        await db.commit()
+
+    async def _migrate_without_rowid(self, db: aiosqlite.Connection) -> None:
+        """Rebuild a rowid recordings table as WITHOUT ROWID.
+
+        Lookups by id then read the table directly instead of going through
+        a separate primary key index. The old rowids carry over as fts_rowid;
+        the search table is dropped here and rebuilt by _create_schema.
+        """
+        async with db.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'recordings'"
+        ) as cursor:
+            row = await cursor.fetchone()
+        if row is None or "WITHOUT ROWID" in row[0].upper():
+            return
+
+        logger.info("Migrating recordings table to WITHOUT ROWID")
+        # Dropping the old table also drops its indexes and triggers, which
+        # _create_schema recreates. Row counts don't change, so the counters
+        # in state stay valid.
+        await db.executescript(f"""
+            BEGIN;
+            DROP TABLE IF EXISTS recordings_fts;
+            CREATE TABLE recordings_new {RECORDINGS_TABLE_DDL};
+            INSERT INTO recordings_new ({RECORDING_COLUMNS}, fts_rowid)
+                SELECT {RECORDING_COLUMNS}, rowid FROM recordings;
+            DROP TABLE recordings;
+            ALTER TABLE recordings_new RENAME TO recordings;
+            COMMIT;
+        """)
+
+    async def index_recording(self, meta_path: Path) -> str | None:
+        """Index a recording from its metadata file. Returns its ID if indexed."""
+        ids = await self.index_recordings([meta_path])
+        return ids[0] if ids else None
+
+    async def index_recordings(
+        self, meta_paths: list[Path], export_types: Sequence[str] = ()
+    ) -> list[str]:
+        """Index several recordings in a single transaction.
+
+        Files that can't be read or validated are logged and skipped. For each
+        indexed recording, an export job of every type in export_types is
+        queued in the same transaction. Returns the IDs of the recordings
+        that were written to the index.
+        """
+        if not meta_paths:
+            return []
+
+        # List each directory once for the whole batch, then split parsing
+        # across the parse pool; a single file stays on one worker
+        loop = asyncio.get_running_loop()
+        entries = await loop.run_in_executor(
+            self._parse_pool, scan_recording_files, meta_paths
+        )
+        chunk_size = -(-len(meta_paths) // READ_WORKERS)
+        chunks = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    self._parse_pool,
+                    _read_recording_rows,
+                    meta_paths[i : i + chunk_size],
+                    entries,
+                )
+                for i in range(0, len(meta_paths), chunk_size)
+            )
+        )
+        rows = [row for chunk in chunks for row in chunk]
+        if not rows:
+            return []
+
+        ids = [row[0] for row in rows]
+        async with self.write_transaction() as db:
+            await db.executemany(INSERT_RECORDING_SQL, rows)
+            # Rows skipped over an atuin_id conflict aren't in the table
+            async with db.execute(
+                SELECT_EXISTING_IDS_SQL, (dumps(ids).decode(),)
+            ) as cursor:
+                written = {row[0] async for row in cursor}
+            ids = [rid for rid in ids if rid in written]
+
+            if export_types:
+                await db.executemany(
+                    INSERT_EXPORT_SQL,
+                    [(rid, export_type) for rid in ids for export_type in export_types],
+                )
+        return ids
 
     async def get_by_atuin_id(self, atuin_id: str) -> IndexedRecording | None:
         """Get recording by atuin ID."""
-        async with self._db.execute(
-            "SELECT * FROM recordings WHERE atuin_id = ?", (atuin_id,)
+        async with self._acquire_read() as db, db.execute(
+            SELECT_BY_ATUIN_ID_SQL, (atuin_id,)
         ) as cursor:
             row = await cursor.fetchone()
             if row:
-                return IndexedRecording.from_row(dict(row))
+                return IndexedRecording.from_row(row)
             return None
 
     async def get_by_id(self, recording_id: str) -> IndexedRecording | None:
         """Get recording by ID."""
-        async with self._db.execute(
-            "SELECT * FROM recordings WHERE id = ?", (recording_id,)
+        async with self._acquire_read() as db, db.execute(
+            SELECT_BY_ID_SQL, (recording_id,)
         ) as cursor:
             row = await cursor.fetchone()
             if row:
-                return IndexedRecording.from_row(dict(row))
+                return IndexedRecording.from_row(row)
             return None
 
     async def list_recordings(
         self,
         limit: int = 50,
-        offset: int = 0,
         failed_only: bool = False,
         cwd: str | None = None,
-    ) -> AsyncIterator[IndexedRecording]:
-        """List recordings with filters."""
-        query = "SELECT * FROM recordings WHERE 1=1"
-        params = []
+        before_ts: float | None = None,
+        before_id: str | None = None,
+    ) -> AsyncGenerator[IndexedRecording, None]:
+        """List recordings with filters, newest first.
+
+        Pass the timestamp and ID of the last recording of a page as
+        before_ts/before_id to get the next page.
+        """
+        async with self._acquire_read() as db:
+            query, params = await _list_query(
+                db, RECORDING_COLUMNS, limit, failed_only, cwd, before_ts, before_id
+            )
+            async with db.execute(query, params) as cursor:
+                async for row in cursor:
+                    yield IndexedRecording.from_row(row)
+
+    async def list_recordings_summary(
+        self,
+        limit: int = 50,
+        failed_only: bool = False,
+        cwd: str | None = None,
+        before_ts: float | None = None,
+        before_id: str | None = None,
+    ) -> AsyncGenerator[dict[str, Any], None]:
+        """Like list_recordings, but yield plain dicts of SUMMARY_COLUMNS.
 
-        if failed_only:
-            query += " AND exit_code != 0"
-        if cwd:
-            query += " AND cwd LIKE ?"
-            params.append(f"{cwd}%")
+        For replies that are serialized straight back out: the values are
+        already JSON-native and the unused path and host columns aren't read.
+        """
+        async with self._acquire_read() as db:
+            query, params = await _list_query(
+                db, SUMMARY_COLUMNS, limit, failed_only, cwd, before_ts, before_id
+            )
+            async with db.execute(query, params) as cursor:
+                async for row in cursor:
+                    yield dict(row)
 
-        query += " ORDER BY timestamp DESC LIMIT ? OFFSET ?"
-        params.extend([limit, offset])
+    async def search(self, query: str, limit: int = 20) -> list[IndexedRecording]:
+        """Find recordings whose command contains query (case-insensitive)."""
+        if len(query) >= 3:
+            # Trigram index: a quoted phrase matches any substring
+            phrase = '"' + query.replace('"', '""') + '"'
+            sql = SEARCH_FTS_SQL
+            params = (phrase, limit)
+        else:
+            # Too short for trigrams; scan instead
+            sql = SEARCH_SCAN_SQL
+            params = (query, limit)
 
-        async with self._db.execute(query, params) as cursor:
-            async for row in cursor:
-                yield IndexedRecording.from_row(dict(row))
+        async with self._acquire_read() as db, db.execute(sql, params) as cursor:
+            return [IndexedRecording.from_row(row) async for row in cursor]
 
     async def get_stats(self) -> dict:
         """Get recording statistics."""
-        stats = {}
+        async with self._acquire_read() as db, db.execute(
+            """
+            SELECT key, CAST(value AS INTEGER) FROM state
+            WHERE key IN ('total_count', 'failed_count')
+        """
+        ) as cursor:
+            return {key: value async for key, value in cursor}
+
+    async def purge_older_than(
+        self, cutoff: float, dry_run: bool = False
+    ) -> list[tuple[str, str]]:
+        """Remove recordings older than cutoff. Returns (id, meta_path) pairs."""
+        return await self._purge("timestamp < ?", (cutoff,), dry_run)
+
+    async def purge_beyond_count(
+        self, max_count: int, dry_run: bool = False
+    ) -> list[tuple[str, str]]:
+        """Remove all but the newest max_count recordings. Returns (id, meta_path) pairs."""
+        return await self._purge(
+            "id IN (SELECT id FROM recordings ORDER BY timestamp DESC LIMIT -1 OFFSET ?)",
+            (max_count,),
+            dry_run,
+        )
 
-        async with self._db.execute("SELECT COUNT(*) FROM recordings") as cursor:
-            stats["total_count"] = (await cursor.fetchone())[0]
+    async def purge_oldest_bytes(
+        self, excess_bytes: int, dry_run: bool = False
+    ) -> list[tuple[str, str]]:
+        """Remove the oldest recordings until at least excess_bytes are covered.
 
-        async with self._db.execute(
-            "SELECT COUNT(*) FROM recordings WHERE exit_code != 0"
+        Returns (id, meta_path) pairs.
+        """
+        return await self._purge(
+            """
+            id IN (
+                SELECT id FROM (
+                    SELECT id, size_bytes, SUM(size_bytes) OVER (
+                        ORDER BY timestamp ASC, id ASC ROWS UNBOUNDED PRECEDING
+                    ) AS running_bytes
+                    FROM recordings
+                )
+                WHERE running_bytes - size_bytes < ?
+            )
+            """,
+            (excess_bytes,),
+            dry_run,
+        )
+
+    async def _purge(
+        self, where: str, params: tuple, dry_run: bool
+    ) -> list[tuple[str, str]]:
+        """Delete matching rows in one statement, or just select them on a dry run."""
+        if dry_run:
+            sql = f"SELECT id, meta_path FROM recordings WHERE {where}"
+            async with self._acquire_read() as db, db.execute(sql, params) as cursor:
+                return [(row[0], row[1]) async for row in cursor]
+
+        sql = f"DELETE FROM recordings WHERE {where} RETURNING id, meta_path"
+        async with self.write_transaction() as db, db.execute(sql, params) as cursor:
+            return [(row[0], row[1]) async for row in cursor]
+
+    async def get_storage_stats(self) -> dict:
+        """Get recording count and storage use by file type."""
+        async with self._acquire_read() as db, db.execute(
+            """
+            SELECT COUNT(*), COALESCE(SUM(size_bytes), 0),
+                   COALESCE(SUM(cast_bytes), 0), COALESCE(SUM(gif_bytes), 0)
+            FROM recordings
+        """
         ) as cursor:
-            stats["failed_count"] = (await cursor.fetchone())[0]
+            total_count, total_size, cast_size, gif_size = await cursor.fetchone()
 
-        return stats
+        return {
+            "total_count": total_count,
+            "total_size": total_size,
+            "cast_size": cast_size,
+            "gif_size": gif_size,
+        }
+
+    async def get_total_size(self) -> int:
+        """Get total bytes used by indexed recordings."""
+        async with self._acquire_read() as db, db.execute(
+            "SELECT COALESCE(SUM(size_bytes), 0) FROM recordings"
+        ) as cursor:
+            return (await cursor.fetchone())[0]
 
     async def delete_recording(self, recording_id: str) -> bool:
         """Delete a recording from index."""
-        result = await self._db.execute(
-            "DELETE FROM recordings WHERE id = ?", (recording_id,)
-        )
-        await self._db.commit()
+        async with self.write_transaction() as db:
+            result = await db.execute(
+                "DELETE FROM recordings WHERE id = ?", (recording_id,)
+            )
         return result.rowcount > 0
+
+
+async def _list_query(
+    db: aiosqlite.Connection,
+    columns: str,
+    limit: int,
+    failed_only: bool,
+    cwd: str | None,
+    before_ts: float | None,
+    before_id: str | None,
+) -> tuple[str, list[Any]]:
+    """Build the SQL and parameters for a filtered, keyset-paginated listing.
+
+    A cwd range can't also deliver rows in timestamp order, so a cwd filter
+    either sorts its matches or scans in time order, depending on how many
+    recordings the prefix matches.
+    """
+    query = f"SELECT {columns} FROM recordings"
+    conditions = []
+    params: list[Any] = []
+
+    if failed_only:
+        conditions.append("exit_code != 0")
+    if cwd:
+        cwd_end = cwd + CWD_PREFIX_END
+        # Count through the index, stopping at the threshold
+        async with db.execute(
+            COUNT_CWD_SQL, (cwd, cwd_end, CWD_SORT_MAX_ROWS + 1)
+        ) as cursor:
+            (matches,) = await cursor.fetchone()
+
+        # A range rather than LIKE: LIKE is case-insensitive, so it can't
+        # use the BINARY idx_cwd index. Unary + keeps the planner off
+        # idx_cwd for broad prefixes.
+        if matches > CWD_SORT_MAX_ROWS:
+            conditions.append("+cwd >= ? AND +cwd < ?")
+        else:
+            conditions.append("cwd >= ? AND cwd < ?")
+        params.extend([cwd, cwd_end])
+    if before_ts is not None and before_id is not None:
+        conditions.append("(timestamp, id) < (?, ?)")
+        params.extend([before_ts, before_id])
+
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY timestamp DESC, id DESC LIMIT ?"
+    params.append(limit)
+
+    return query, params
+
+
+_read_buffers = threading.local()
+
+
+def _load_json_file(path: Path) -> Any:
+    """Decode a JSON file without building an intermediate bytes copy.
+
+    Small files are read straight into a buffer reused by the calling thread;
+    larger ones are decoded from a memory map.
+    """
+    buf = getattr(_read_buffers, "buf", None)
+    if buf is None:
+        buf = _read_buffers.buf = bytearray(SMALL_FILE_SIZE + 1)
+
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        n = os.readv(fd, [buf])
+        if n <= SMALL_FILE_SIZE:
+            with memoryview(buf)[:n] as view:
+                return loads(view)
+
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                return loads(view)
+    finally:
+        os.close(fd)
+
+
+def _read_recording_rows(
+    meta_paths: list[Path], entries: dict[str, list[os.DirEntry[str]]]
+) -> list[tuple]:
+    """Parse metadata files into recordings rows, skipping invalid ones.
+
+    entries maps each metadata path to its recording's entries, as returned by
+    scan_recording_files.
+
+    Metadata is written by our own hooks, so fields are read straight from
+    the decoded JSON rather than validated through RecordingMetadata.
+    """
+    rows = []
+    for meta_path in meta_paths:
+        try:
+            data = _load_json_file(meta_path)
+            recording_id, command, cwd = data["id"], data["command"], data["cwd"]
+            timestamp = data["timestamp"]
+            # These fill NOT NULL columns; a bad value must skip this file here
+            # rather than fail the whole batch insert
+            if not all(isinstance(value, str) for value in (recording_id, command, cwd)):
+                raise TypeError("id, command and cwd must be strings")
+            if isinstance(timestamp, bool) or not isinstance(timestamp, (int, float)):
+                raise TypeError("timestamp must be a number")
+
+            files = data.get("files") or {}
+            row = (
+                recording_id,
+                # Hooks write "" when atuin is unavailable; atuin_id is UNIQUE
+                data.get("atuin_id") or None,
+                command,
+                timestamp,
+                data.get("duration"),
+                data.get("exit_code"),
+                cwd,
+                data.get("shell"),
+                data.get("user"),
+                data.get("hostname"),
+                files.get("cast"),
+                files.get("gif"),
+                files.get("screenshot"),
+                str(meta_path),
+                *recording_sizes(entries[str(meta_path)]),
+            )
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.error(f"Failed to read recording {meta_path}: {e}")
+            continue
+
+        rows.append(row)
+    return rows
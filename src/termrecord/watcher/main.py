@@ -14,6 +14,12 @@ from termrecord.watcher.file_watcher import FileWatcher
 from termrecord.watcher.indexer import Indexer
 from termrecord.watcher.server import StatusServer
 
+# Most recordings indexed in one transaction
+INGEST_BATCH_SIZE = 256
+
+# How long to wait after a new recording for others to join its batch
+INGEST_DEBOUNCE_SECONDS = 0.05
+
 
 class WatcherService:
     """Main watcher service orchestrator."""
@@ -45,20 +51,58 @@ class WatcherService:
             self.recordings_dir, on_new_recording=self._handle_new_recording
         )
         self.server = StatusServer(
-            self.config.watcher.socket_path, indexer=self.indexer, exporter=self.exporter
+            self.config.watcher.socket_path,
+            indexer=self.indexer,
+            cleanup=self.cleanup,
         )
 
+        # New recordings waiting to be indexed; None tells the ingest loop to
+        # finish up and exit
+        self._pending: asyncio.Queue[Path | None] = asyncio.Queue()
+        self._ingest_task: asyncio.Task | None = None
+
     async def _handle_new_recording(self, meta_path: Path) -> None:
-        """Handle a new .meta.json file."""
-        try:
-            self.logger.info(f"Indexing new recording: {meta_path}")
-            await self.indexer.index_recording(meta_path)
+        """Queue a new .meta.json file for indexing."""
+        self._pending.put_nowait(meta_path)
 
-            if self.config.export.gif_enabled:
-                recording_id = meta_path.stem.replace(".meta", "")
-                await self.exporter.enqueue(recording_id, "gif")
+    async def _ingest_loop(self) -> None:
+        """Index queued recordings, batching those that arrive close together."""
+        loop = asyncio.get_running_loop()
+        done = False
+        while not done:
+            first = await self._pending.get()
+            if first is None:
+                return
+
+            batch = [first]
+            deadline = loop.time() + INGEST_DEBOUNCE_SECONDS
+            while len(batch) < INGEST_BATCH_SIZE:
+                try:
+                    if not self._pending.empty():
+                        meta_path = self._pending.get_nowait()
+                    else:
+                        meta_path = await asyncio.wait_for(
+                            self._pending.get(), timeout=max(0, deadline - loop.time())
+                        )
+                except TimeoutError:
+                    break
+
+                if meta_path is None:
+                    done = True
+                    break
+                batch.append(meta_path)
+
+            await self._index_batch(batch)
+
+    async def _index_batch(self, batch: list[Path]) -> None:
+        """Index a batch of new recordings and queue their exports."""
+        try:
+            self.logger.info(f"Indexing {len(batch)} new recording(s)")
+            # Export jobs are committed together with the index rows
+            export_types = ("gif",) if self.config.export.gif_enabled else ()
+            await self.indexer.index_recordings(batch, export_types=export_types)
         except Exception as e:
-            self.logger.error(f"Failed to handle recording {meta_path}: {e}")
+            self.logger.error(f"Failed to index {len(batch)} recording(s): {e}")
 
     async def start(self) -> None:
         """Start the watcher service."""
@@ -69,6 +113,7 @@ class WatcherService:
 
         # Initialize components
         await self.indexer.initialize()
+        self._ingest_task = asyncio.create_task(self._ingest_loop())
         await self.file_watcher.start()
         await self.exporter.start()
         await self.cleanup.start()
@@ -84,21 +129,25 @@ class WatcherService:
         await self.cleanup.stop()
         await self.exporter.stop()
         await self.file_watcher.stop()
+        if self._ingest_task:
+            # Index what is already queued before the database closes
+            self._pending.put_nowait(None)
+            await self._ingest_task
         await self.indexer.close()
 
         self.logger.info("Watcher service stopped")
 
     async def run(self) -> None:
         """Run the watcher service until interrupted."""
-        await self.start()
-
-        # Set up signal handlers
+        # Installed first so a signal during startup still stops cleanly
         loop = asyncio.get_running_loop()
         stop_event = asyncio.Event()
 
         for sig in (signal.SIGINT, signal.SIGTERM):
             loop.add_signal_handler(sig, stop_event.set)
 
+        await self.start()
+
         # Wait for stop signal
         await stop_event.wait()
 
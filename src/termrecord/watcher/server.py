@@ -3,23 +3,36 @@
 from __future__ import annotations
 
 import asyncio
-import json
+from contextlib import aclosing, suppress
 from pathlib import Path
 
-from termrecord.watcher.exporter import ExportQueue
+from termrecord.jsonutil import dumps, loads
+from termrecord.protocol import HEADER_SIZE, decode_header, encode_frame
+from termrecord.watcher.cleanup import CleanupScheduler
 from termrecord.watcher.indexer import Indexer
 
+# Requests above this size are decoded on a worker thread
+LARGE_PAYLOAD_BYTES = 16384
+
+# Replies carrying more recordings than this (roughly LARGE_PAYLOAD_BYTES of
+# JSON) are encoded on a worker thread
+LARGE_REPLY_RECORDINGS = 50
+
 
 class StatusServer:
     """Unix socket server for CLI communication."""
 
     def __init__(
-        self, socket_path: Path, indexer: Indexer, exporter: ExportQueue
+        self,
+        socket_path: Path,
+        indexer: Indexer,
+        cleanup: CleanupScheduler,
     ):
         self.socket_path = socket_path.expanduser()
         self.indexer = indexer
-        self.exporter = exporter
+        self.cleanup = cleanup
         self._server: asyncio.Server | None = None
+        self._clients: set[asyncio.StreamWriter] = set()
 
     async def start(self) -> None:
         """Start the server."""
@@ -38,6 +51,9 @@ class StatusServer:
         """Stop the server."""
         if self._server:
             self._server.close()
+            # Drop idle persistent connections so wait_closed can finish
+            for writer in list(self._clients):
+                writer.close()
             await self._server.wait_closed()
 
         if self.socket_path.exists():
@@ -46,22 +62,83 @@ class StatusServer:
     async def _handle_client(
         self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
     ) -> None:
-        """Handle a client connection."""
-        try:
-            data = await reader.readline()
-            message = json.loads(data.decode().strip())
+        """Handle a client connection.
 
-            response = await self._process_message(message)
-
-            writer.write(json.dumps(response).encode() + b"\n")
-            await writer.drain()
-        except Exception as e:
-            error_response = {"error": str(e)}
-            writer.write(json.dumps(error_response).encode() + b"\n")
-            await writer.drain()
+        Clients may send any number of requests before closing the connection.
+        """
+        self._clients.add(writer)
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(HEADER_SIZE)
+                    data = await reader.readexactly(decode_header(header))
+                except asyncio.IncompleteReadError:
+                    break  # Client closed the connection
+
+                try:
+                    if len(data) > LARGE_PAYLOAD_BYTES:
+                        message = await asyncio.to_thread(loads, data)
+                    else:
+                        message = loads(memoryview(data))
+                    if message.get("action") == "list":
+                        await self._stream_list(message, writer)
+                        continue
+                    response = await self._process_message(message)
+                except Exception as e:
+                    response = {"error": str(e)}
+
+                if len(response.get("recordings", ())) > LARGE_REPLY_RECORDINGS:
+                    # Don't stall other clients and the indexer while encoding
+                    payload = await asyncio.to_thread(dumps, response)
+                else:
+                    payload = dumps(response)
+                writer.write(encode_frame(payload))
+                await writer.drain()
+        except ConnectionError:
+            pass
         finally:
+            self._clients.discard(writer)
             writer.close()
-            await writer.wait_closed()
+            # A client that hung up mid-reply leaves an unflushed write behind
+            with suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _stream_list(self, message: dict, writer: asyncio.StreamWriter) -> None:
+        """Stream a listing: a list_begin frame, one frame per recording, then list_end.
+
+        Rows are written as they are read, so only one is held in memory.
+        """
+        limit = message.get("limit", 50)
+        rows = self.indexer.list_recordings_summary(
+            limit=limit,
+            failed_only=message.get("failed_only", False),
+            cwd=message.get("cwd"),
+            before_ts=message.get("before_ts"),
+            before_id=message.get("before_id"),
+        )
+
+        writer.write(encode_frame(dumps({"type": "list_begin"})))
+        count = 0
+        last = None
+        # aclosing hands the read connection back even if the client goes away
+        async with aclosing(rows):
+            try:
+                async for last in rows:
+                    count += 1
+                    writer.write(encode_frame(dumps(last)))
+                    await writer.drain()
+            except ConnectionError:
+                raise
+            except Exception as e:
+                writer.write(encode_frame(dumps({"type": "error", "error": str(e)})))
+                return
+
+        # Cursor for the following page, if there may be one
+        next_page = None
+        if count == limit and last is not None:
+            next_page = {"before_ts": last["timestamp"], "before_id": last["id"]}
+        writer.write(encode_frame(dumps({"type": "list_end", "next": next_page})))
+        await writer.drain()
 
     async def _process_message(self, message: dict) -> dict:
         """Process a client message."""
@@ -71,16 +148,8 @@ class StatusServer:
             stats = await self.indexer.get_stats()
             return {"status": "running", "stats": stats}
 
-        elif action == "list":
-            recordings = []
-            async for rec in self.indexer.list_recordings(
-                limit=message.get("limit", 50),
-                offset=message.get("offset", 0),
-                failed_only=message.get("failed_only", False),
-                cwd=message.get("cwd"),
-            ):
-                recordings.append(rec.model_dump())
-            return {"recordings": recordings}
+        elif action == "stats":
+            return {"stats": await self.indexer.get_storage_stats()}
 
         elif action == "get":
             recording_id = message.get("id")
@@ -95,12 +164,14 @@ class StatusServer:
             else:
                 return {"recording": None}
 
-        elif action == "cleanup":
-            from termrecord.watcher.cleanup import CleanupScheduler
+        elif action == "search":
+            recordings = await self.indexer.search(
+                message.get("query", ""), limit=message.get("limit", 20)
+            )
+            return {"recordings": [rec.model_dump() for rec in recordings]}
 
-            cleanup = CleanupScheduler(self.exporter.config, self.indexer)
-            result = await cleanup.run_cleanup(dry_run=message.get("dry_run", False))
-            return result
+        elif action == "cleanup":
+            return await self.cleanup.run_cleanup(dry_run=message.get("dry_run", False))
 
         else:
             return {"error": f"Unknown action: {action}"}